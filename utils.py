@@ -4,11 +4,16 @@
 # -----------------------------------------------------------
 
 # %% standard lib imports
-import copy, re
+import os
+from collections import abc
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from sys import stderr
 
+# %% third party imports
+import numpy as np
+
 #===================================================================================================
 # Enums
 class KEYWORD_TYPE(Enum):
@@ -43,6 +48,9 @@ class ELEMENT_TYPE(Enum):
 class Node():
     ''' Class for storing the information of a node
     '''
+
+    __slots__ = ('_nid', '_coord', '_source', 'modified')
+
     def __init__(self, nid, plist=(0, 0, 0), source: tuple[int, int]=None):
         ''' Initialize the node with a list of coordinates and a line number
         '''
@@ -75,7 +83,8 @@ class Node():
         ''' Set the coordinates of the node
         '''
         if isinstance(value, Node):  # passing a node
-            self._coord = copy.deepcopy(value._coord)
+            # coordinates are immutable tuples, so sharing the reference is safe
+            self._coord = value._coord
         elif isinstance(value, tuple):  # passing a tuple or a list
             self._coord = value
         else:
@@ -102,13 +111,16 @@ class Node():
 class Element():
     ''' Class for storing the information of an element
     '''
-    def __init__(self, eid, nodes: list[Node]=[], type=ELEMENT_TYPE.UNKNOWN, source: tuple[int, int]=None, priorEid: int=None):
+
+    __slots__ = ('_eid', '_nodes', '_type', '_source', '_priorEid', 'modified')
+
+    def __init__(self, eid, nodes: list[Node]=None, type=ELEMENT_TYPE.UNKNOWN, source: tuple[int, int]=None, priorEid: int=None):
 
         # element id
         self._eid = eid
 
-        # nodes
-        self._nodes = nodes
+        # nodes (a mutable default would be shared across instances)
+        self._nodes = () if nodes is None else nodes
 
         # type
         self._type = type
@@ -186,14 +198,18 @@ class Element():
 class Part():
     ''' Class for storing the information of a part
     '''
-    def __init__(self, pid, elements: list[Element]=[], elementType: ELEMENT_TYPE=ELEMENT_TYPE.UNKNOWN, source: tuple[int, int, int]=None, header: str="", secid: int=0, mid: int=0, eosid: int=0, hgid: int=0, grav: int=0, adpopt: int=0, tmid: int=0):
+
+    __slots__ = ('_pid', '_elements', '_elementType', '_source', '_header', '_secid',
+                 '_mid', '_eosid', '_hgid', '_grav', '_adpopt', '_tmid', 'modified')
+
+    def __init__(self, pid, elements: list[Element]=None, elementType: ELEMENT_TYPE=ELEMENT_TYPE.UNKNOWN, source: tuple[int, int, int]=None, header: str="", secid: int=0, mid: int=0, eosid: int=0, hgid: int=0, grav: int=0, adpopt: int=0, tmid: int=0):
         ''' Initialize the part with a list of elements and a line number
         '''
         # part id
         self._pid = pid
 
         # the elements are stored as a set
-        self._elements = set(elements)
+        self._elements = set() if elements is None else set(elements)
 
         # element type
         self._elementType = elementType
@@ -416,15 +432,7 @@ class Part():
                     e.g. [[n1_ind,n2_ind,n3_ind,n4_ind],[n4_ind,n5_ind,n6_ind]]
         '''
 
-        # Create a set of the vertices that only appear in the part
-        verts = list({v.coord for element in self.elements for v in element.nodes})
-
-        # Create a mapping from the new vertex list to the new index
-        vert_map = dict(zip(verts, range(len(verts))))
-
-        # Iterate over the reduced vertex list and update the face indices
-        faces = [[vert_map[v.coord] for v in element.nodes] for element in self.elements]
-        return verts, faces
+        return buildVertsFaces([element.nodes for element in self.elements])
 
     def toK(self, sep=", "):
         ''' Return the part in K format
@@ -442,26 +450,92 @@ def eprint(*args, **kwargs):
 def is_list_of_strings(lst):
     ''' Check if the list is a list of strings
     '''
-    return isinstance(lst, list) and all(isinstance(elem, str) or isinstance(elem, Path) for elem in lst)
+    return isinstance(lst, list) and all(isinstance(elem, (str, Path)) for elem in lst)
+
 
+# The container types the setters actually receive, checked first so the
+# common case is one C-level isinstance
+_SEQ_FAST = (list, tuple, set, frozenset, np.ndarray)
 
 def is_sequence(arg):
-    ''' Check if the input is iterable.
-    Reference: https://stackoverflow.com/questions/1952464/in-python-how-do-i-determine-if-an-object-is-iterable
+    ''' Check if the input is a sequence of items (strings excluded).
+
+    The fast path is a single isinstance against the concrete container
+    types, much cheaper than the old chain of hasattr probes (each one an
+    MRO walk with an internally swallowed AttributeError); other iterables
+    fall back to the abc check. This sits on the setter path of every
+    Node/Element/Part.
     '''
-    if hasattr(arg, "strip"):
-        return False
-    if hasattr(arg, "__getslice__"):
-        return True
-    if hasattr(arg, "__iter__"):
+    if isinstance(arg, _SEQ_FAST):
         return True
-    return False
+    if isinstance(arg, (str, bytes)):
+        return False
+    return isinstance(arg, abc.Iterable)
 
 
 def getAllKFilesInFolder(folderPath: str) -> list[str]:
     ''' Return a list of all .k files in the folder
+
+    os.scandir reads the directory in one syscall batch and skips the
+    per-entry Path construction of pathlib glob; callers only need the
+    path strings.
+    '''
+    return [entry.path for entry in os.scandir(folderPath)
+            if entry.name.endswith('.k') and entry.is_file()]
+
+
+def buildVertsFaces(faceNodes: list[list[Node]]):
+    ''' Build a vertex array and face index lists from per-element node lists
+
+    Deduplicates by node id instead of hashing coordinate tuples: node ids
+    are already unique, integer dedup is much cheaper, and it avoids
+    float-equality hazards. np.unique does the dedup and the face remapping
+    in one vectorized pass.
+
+    faceNodes: one list of Node objects per element
+    Returns (verts, faces) where verts is a contiguous (V, 3) float32 array
+    and faces holds the per-element indices into verts
+    '''
+    flat = [node for nodes in faceNodes for node in nodes]
+    if not flat:
+        return np.empty((0, 3), dtype=np.float32), []
+
+    nids = np.fromiter((node.nid for node in flat), dtype=np.int64, count=len(flat))
+    uniq, firstIdx, inverse = np.unique(nids, return_index=True, return_inverse=True)
+
+    # Coordinates of each unique node, quantized to float32 for display
+    verts = np.array([flat[i].coord for i in firstIdx], dtype=np.float32)
+
+    # Split the remapped flat indices back into per-element faces
+    faces = []
+    start = 0
+    for nodes in faceNodes:
+        end = start + len(nodes)
+        faces.append(inverse[start:end].tolist())
+        start = end
+    return verts, faces
+
+
+@lru_cache(maxsize=64)
+def _splitLayout(groupLengths, enforcedGroups):
+    ''' Precompute the slicing plan for one fixed-width card layout
+
+    A k file uses a handful of layouts but splitString runs once per
+    fixed-width line, so the plan is memoized on the (lengths, enforced)
+    tuples. Returns the slice bounds per group, a map from valid total
+    line length to the number of groups it carries, and the minimum
+    group count implied by the enforced flags.
     '''
-    return list(Path(folderPath).glob('*.k'))
+    bounds = []
+    validLengths = {0: 0}
+    start = 0
+    for i, length in enumerate(groupLengths):
+        bounds.append((start, start + length))
+        start += length
+        validLengths[start] = i + 1
+
+    minGroups = max((i + 1 for i, enforced in enumerate(enforcedGroups) if enforced), default=0)
+    return bounds, validLengths, minGroups
 
 
 def splitString(s, groupLengths, enforcedGroups):
@@ -469,13 +543,16 @@ def splitString(s, groupLengths, enforcedGroups):
     s: string to split
     groupLengths: list of group lengths
     enforcedGroups: list of booleans indicating whether the group is enforced
+
+    The line length must land exactly on a group boundary covering every
+    enforced group; trailing optional groups that are absent come back as
+    None. Plain slicing at precomputed offsets replaces the old
+    (.{n})(.{m})?-style regex, which walked the re engine once per line.
     '''
-    pattern = ''.join(f'(.{{{length}}})' if enforced else f'(.{{{length}}})?' for length, enforced in zip(groupLengths, enforcedGroups))
-    pattern = f'^{pattern}$'
-    match = re.match(pattern, s)
-
-    if match:
-        groups = match.groups()
-        return groups
-    else:
-        return None
\ No newline at end of file
+    bounds, validLengths, minGroups = _splitLayout(tuple(groupLengths), tuple(enforcedGroups))
+
+    numGroups = validLengths.get(len(s))
+    if numGroups is None or numGroups < minGroups:
+        return None
+
+    return tuple(s[a:b] for a, b in bounds[:numGroups]) + (None,) * (len(bounds) - numGroups)
\ No newline at end of file